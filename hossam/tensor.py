@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 # -------------------------------------------------------------
+from __future__ import annotations
 
+import hashlib
 import numpy as np
-from datetime import datetime as dt
+from collections import namedtuple
+from contextlib import contextmanager
 
 # -------------------------------------------------------------
 from pycallgraphix.wrapper import register_method
@@ -14,22 +17,14 @@ from pandas import DataFrame
 from matplotlib import pyplot as plt
 
 # -------------------------------------------------------------
-from regex import R
-from tensorflow.random import set_seed
-from tensorflow.keras.initializers import GlorotUniform
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.callbacks import (
-    History,
-    EarlyStopping,
-    ReduceLROnPlateau,
-    TensorBoard,
-    ModelCheckpoint,
-)
-from tensorflow.keras.optimizers import Adam, RMSprop
+# tensorflow, kerastuner는 import 비용이 크므로 실제로 사용하는 함수 안에서 불러온다.
+from typing import TYPE_CHECKING
 
-# -------------------------------------------------------------
-from kerastuner import Hyperband
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from tensorflow.keras import optimizers
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.callbacks import History
 
 # -------------------------------------------------------------
 from .util import my_pretty_table
@@ -39,17 +34,452 @@ from .classification import my_classification_result, my_classification_report
 
 # -------------------------------------------------------------
 
-set_seed(get_random_state())
-__initializer__ = GlorotUniform(seed=get_random_state())
+__initializer__ = None
 
 __HB_DIR__ = "tf_hyperband"
 
+# Dense 레이어 하나의 구성 정보
+LayerSpec = namedtuple(
+    "LayerSpec", "units activation input_shape dtype", defaults=(None, None)
+)
+
+
+def __get_project_name(key: tuple) -> str:
+    return "tf_hb_%s" % hashlib.md5(repr(key).encode()).hexdigest()[:12]
+
+
+def __get_fingerprint(*arrays) -> str:
+    """배열의 크기, 자료형, 내용으로 md5 해시를 생성한다.
+
+    Returns:
+        str: md5 해시 문자열
+    """
+    h = hashlib.md5()
+
+    for a in arrays:
+        if a is None:
+            h.update(b"None")
+            continue
+
+        a = np.ascontiguousarray(a)
+        h.update(repr((a.shape, a.dtype.str)).encode())
+        h.update(a.tobytes())
+
+    return h.hexdigest()
+
+
+def __get_initializer():
+    """난수 시드를 고정하고 공용 가중치 초기화 객체를 반환한다.
+
+    최초 호출 시에만 tensorflow를 불러와 생성하며, 이후에는 생성된 객체를 재사용한다.
+
+    Returns:
+        GlorotUniform: 가중치 초기화 객체
+    """
+    global __initializer__
+
+    if __initializer__ is None:
+        from tensorflow.random import set_seed
+        from tensorflow.keras.initializers import GlorotUniform
+
+        set_seed(get_random_state())
+        __initializer__ = GlorotUniform(seed=get_random_state())
+
+    return __initializer__
+
+
+def __get_precision_policy(use_mixed_precision: bool) -> str:
+    """모델 생성에 사용할 정밀도 정책 이름을 반환한다.
+
+    Compute Capability 7.0 이상의 GPU(Volta, Turing, Ampere 등)가 있는 경우에만 혼합 정밀도를 적용하고,
+    그 외의 경우에는 사용자가 설정한 현재 전역 정책을 그대로 사용한다.
+
+    Args:
+        use_mixed_precision (bool): 혼합 정밀도 사용 여부
+
+    Returns:
+        str: "mixed_float16" 또는 현재 정책을 유지하는 경우 None
+    """
+    import tensorflow as tf
+
+    if use_mixed_precision:
+        for gpu in tf.config.list_physical_devices("GPU"):
+            details = tf.config.experimental.get_device_details(gpu)
+
+            if details.get("compute_capability", (0, 0)) >= (7, 0):
+                return "mixed_float16"
+
+    return None
+
+
+@contextmanager
+def __precision_scope(policy: str):
+    """블록 안에서만 전역 정밀도 정책을 변경하고, 블록이 끝나면 이전 정책으로 되돌린다.
+
+    Args:
+        policy (str): 적용할 정밀도 정책 이름. None이면 현재 전역 정책을 변경하지 않는다.
+    """
+    from tensorflow.keras import mixed_precision
+
+    if policy is None:
+        yield
+        return
+
+    prev = mixed_precision.global_policy()
+    mixed_precision.set_global_policy(policy)
+
+    try:
+        yield
+    finally:
+        mixed_precision.set_global_policy(prev)
+
+
+def __get_optimizer(name: str, learning_rate: float) -> optimizers.Optimizer:
+    """이름에 해당하는 최적화 알고리즘 객체를 생성한다.
+
+    파이썬 호출 부담이 적은 legacy 구현을 우선 사용하고, legacy 구현을 지원하지 않는 환경(Keras 3)에서는 기본 구현을 사용한다.
+
+    Args:
+        name (str): 최적화 알고리즘 이름("adam" 또는 "rmsprop")
+        learning_rate (float): 학습률
+
+    Returns:
+        optimizers.Optimizer: 최적화 알고리즘 객체. 지원하지 않는 이름인 경우 None
+    """
+    from tensorflow.keras import optimizers
+
+    if name not in ("adam", "rmsprop"):
+        return None
+
+    cls_name = "Adam" if name == "adam" else "RMSprop"
+
+    try:
+        return getattr(optimizers.legacy, cls_name)(learning_rate=learning_rate)
+    except (AttributeError, ImportError):
+        return getattr(optimizers, cls_name)(learning_rate=learning_rate)
+
+
+def __tf_dataset(
+    x: np.ndarray,
+    y: np.ndarray,
+    batch_size: int,
+    shuffle: bool = False,
+    drop_remainder: bool = False,
+) -> tf.data.Dataset:
+    """독립변수와 종속변수로 배치 단위의 tf.data.Dataset을 생성한다.
+
+    데이터는 최초 1회만 캐시되며, 다음 배치를 미리 준비(prefetch)하여 GPU가 연산하는 동안 데이터 복사가 함께 진행되도록 한다.
+
+    Args:
+        x (np.ndarray): 독립변수
+        y (np.ndarray): 종속변수
+        batch_size (int): 배치 크기
+        shuffle (bool, optional): epoch마다 데이터를 섞을지 여부. Defaults to False.
+        drop_remainder (bool, optional): 배치 크기를 고정하기 위해 마지막에 남는 불완전한 배치를 버릴지 여부. Defaults to False.
+
+    Returns:
+        tf.data.Dataset: 배치 단위의 데이터셋
+    """
+    import tensorflow as tf
+
+    x = np.asarray(x)
+    ds = tf.data.Dataset.from_tensor_slices((x, np.asarray(y))).cache()
+
+    if shuffle:
+        ds = ds.shuffle(len(x), seed=get_random_state())
+
+    ds = ds.batch(batch_size, drop_remainder=drop_remainder).prefetch(tf.data.AUTOTUNE)
+
+    if tf.config.list_physical_devices("GPU"):
+        ds = ds.apply(tf.data.experimental.prefetch_to_device("/gpu:0", buffer_size=2))
+
+    return ds
+
+
+def __tf_hyperband(
+    dense_tune: list,
+    optimizer: any,
+    learning_rate: list,
+    loss: str,
+    metrics: list,
+    epochs: int,
+    factor: int,
+    seed: int,
+    directory: str,
+    project_name: str,
+    use_mixed_precision: bool,
+    xla: bool,
+    steps_per_execution: int,
+):
+    """tf_tune에서 사용할 Hyperband 튜너를 생성한다.
+
+    병렬 탐색 시 각 프로세스가 동일한 튜너를 생성할 수 있도록 tf_tune과 분리되어 있다.
+
+    Returns:
+        Hyperband: Hyperband 튜너
+    """
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense
+    from kerastuner import Hyperband
+
+    __get_initializer()
+    policy = __get_precision_policy(use_mixed_precision)
+
+    # trial마다 반복되지 않도록 레이어 구성 정보를 미리 분리해 둔다.
+    layer_units = [d["units"] for d in dense_tune]
+    # tf_create와 동일하게 LayerSpec에 정의된 항목만 사용하고 나머지는 무시한다.
+    layer_args = [
+        {k: v for k, v in d.items() if k in LayerSpec._fields and k != "units"}
+        for d in dense_tune
+    ]
+
+    # 혼합 정밀도에서도 출력과 손실은 float32로 계산한다.
+    if policy == "mixed_float16" and layer_args:
+        layer_args[-1].setdefault("dtype", "float32")
+
+    def __tf_build(hp) -> Sequential:
+        with __precision_scope(policy):
+            model = Sequential(
+                [
+                    Dense(
+                        units=(
+                            hp.Choice("units", values=units)
+                            if type(units) == list
+                            else units
+                        ),
+                        **args,
+                    )
+                    for units, args in zip(layer_units, layer_args)
+                ]
+            )
+
+            opt = __get_optimizer(
+                optimizer, hp.Choice("learning_rate", values=learning_rate)
+            )
+
+            model.compile(
+                optimizer=opt,
+                loss=loss,
+                metrics=metrics,
+                run_eagerly=False,
+                jit_compile=xla,
+                steps_per_execution=steps_per_execution,
+            )
+
+        return model
+
+    return Hyperband(
+        hypermodel=__tf_build,
+        objective=f"val_{metrics[0]}",
+        max_epochs=epochs,
+        factor=factor,
+        seed=seed,
+        directory=directory,
+        project_name=project_name,
+        overwrite=False,
+    )
+
+
+def __tf_search_worker(
+    tuner_id: str, oracle_port: int, gpu: int, tuner_args: dict, search_args: dict
+) -> None:
+    """KerasTuner 분산 탐색에 참여하는 프로세스의 진입점.
+
+    tuner_id가 "chief"인 프로세스는 oracle 서버를 실행하고, 나머지 프로세스는 oracle로부터 trial을 받아 훈련한다.
+
+    Args:
+        tuner_id (str): KerasTuner 튜너 ID
+        oracle_port (int): oracle 서버 포트
+        gpu (int): 이 프로세스에 할당할 GPU 번호. None이면 GPU를 지정하지 않고, 빈 문자열이면 GPU를 사용하지 않는다.
+        tuner_args (dict): __tf_hyperband에 전달할 파라미터
+        search_args (dict): tuner.search에 전달할 파라미터
+    """
+    import os
+
+    # tensorflow가 로드되기 전에 설정해야 한다.
+    os.environ["KERASTUNER_TUNER_ID"] = tuner_id
+    os.environ["KERASTUNER_ORACLE_IP"] = "127.0.0.1"
+    os.environ["KERASTUNER_ORACLE_PORT"] = str(oracle_port)
+
+    if gpu is not None:
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu)
+
+    # 여러 워커가 같은 GPU를 공유할 수 있으므로 메모리를 필요한 만큼만 할당한다.
+    os.environ["TF_FORCE_GPU_ALLOW_GROWTH"] = "true"
+
+    tuner = __tf_hyperband(**tuner_args)
+    tuner.search(**search_args)
+
+
+def __tf_search_parallel(
+    parallel_trials: int, tuner_args: dict, search_args: dict
+) -> None:
+    """oracle 프로세스 1개와 워커 프로세스 parallel_trials개를 실행하여 Hyperband 탐색을 병렬로 수행한다.
+
+    GPU가 있는 경우 워커마다 GPU를 순서대로 하나씩 할당한다.
+    프로세스는 spawn 방식으로 생성되므로, 스크립트에서 호출할 때는 반드시 `if __name__ == "__main__":` 블록 안에서 호출해야 한다.
+
+    Args:
+        parallel_trials (int): 동시에 실행할 trial(워커 프로세스) 수
+        tuner_args (dict): __tf_hyperband에 전달할 파라미터
+        search_args (dict): tuner.search에 전달할 파라미터
+    """
+    import socket
+    import multiprocessing as mp
+    import tensorflow as tf
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        oracle_port = sock.getsockname()[1]
+
+    gpu_count = len(tf.config.list_physical_devices("GPU"))
+
+    # tensorflow는 fork에 안전하지 않으므로 spawn 방식으로 프로세스를 생성한다.
+    ctx = mp.get_context("spawn")
+
+    procs = [
+        ctx.Process(
+            target=__tf_search_worker,
+            args=("chief", oracle_port, "", tuner_args, search_args),
+        )
+    ]
+
+    for i in range(parallel_trials):
+        procs.append(
+            ctx.Process(
+                target=__tf_search_worker,
+                args=(
+                    f"tuner{i}",
+                    oracle_port,
+                    i % gpu_count if gpu_count else None,
+                    tuner_args,
+                    search_args,
+                ),
+            )
+        )
+
+    for p in procs:
+        p.start()
+
+    chief, workers = procs[0], procs[1:]
+
+    # chief는 워커가 탐색 종료를 전달받아야 끝나므로 워커를 먼저 기다린다.
+    for p in workers:
+        p.join()
+
+    if any(p.exitcode != 0 for p in workers):
+        chief.terminate()
+        chief.join()
+        raise RuntimeError("Parallel hyperband search failed.")
+
+    chief.join()
+
+    if chief.exitcode != 0:
+        raise RuntimeError("Parallel hyperband search failed.")
+
 
-def __get_project_name(src) -> str:
-    if src:
-        return src
+def __get_metric(name: str, y_true_shape: tuple, y_pred_shape: tuple):
+    """compile에 지정된 이름에 해당하는 평가 함수를 반환한다.
 
-    return "tf_%s" % dt.now().strftime("%y%m%d_%H%M%S")
+    "acc", "accuracy"는 Keras의 compile과 동일하게 종속변수와 출력의 형태에 따라 정확도 함수를 선택한다.
+    출력의 마지막 차원이 1이면 binary, 종속변수의 차원이 더 낮거나 종속변수의 마지막 차원만 1이면 sparse categorical,
+    그 외에는 categorical 정확도를 사용한다.
+
+    Args:
+        name (str): 평가 측정항목 이름
+        y_true_shape (tuple): 종속변수의 형태
+        y_pred_shape (tuple): 모델 출력의 형태
+
+    Raises:
+        ValueError: 이름으로 상태가 없는 평가 함수를 찾을 수 없는 경우(AUC, Precision 등 metric 객체로 생성되는 측정항목)
+
+    Returns:
+        callable: y_true, y_pred를 인자로 받는 평가 함수
+    """
+    import inspect
+    import tensorflow as tf
+
+    if name in ("acc", "accuracy"):
+        is_binary = y_pred_shape[-1] == 1
+        is_sparse = len(y_true_shape) < len(y_pred_shape) or (
+            y_true_shape[-1] == 1 and y_pred_shape[-1] > 1
+        )
+
+        if is_binary:
+            name = "binary_accuracy"
+        elif is_sparse:
+            name = "sparse_categorical_accuracy"
+        else:
+            name = "categorical_accuracy"
+
+    fn = tf.keras.metrics.get(name)
+
+    if not inspect.isfunction(fn):
+        raise ValueError("Unsupported stateless metric: %s" % name)
+
+    return fn
+
+
+def __tf_evaluate(model, sets: list, names: list, batch_size: int) -> list:
+    """여러 데이터셋을 하나로 합쳐 한 번의 예측으로 평가한다.
+
+    이름만으로 평가 함수를 찾을 수 없는 측정항목이 있으면 각 데이터셋에 대해 model.evaluate를 사용한다.
+
+    Args:
+        model (Sequential): 평가할 모델
+        sets (list): (독립변수, 종속변수) 튜플의 목록
+        names (list): 계산할 손실 및 평가 측정항목 이름
+        batch_size (int): 훈련에 사용한 배치 크기
+
+    Returns:
+        list: 각 데이터셋에 대한 {측정항목 이름: 값} 사전의 목록
+    """
+    import tensorflow as tf
+
+    try:
+        y_true_shape = np.shape(sets[0][1])
+        fns = {
+            name: (
+                tf.keras.losses.get(model.loss)
+                if name == "loss"
+                else __get_metric(name, y_true_shape, model.output_shape)
+            )
+            for name in names
+        }
+    except ValueError:
+        return [
+            model.evaluate(__tf_dataset(x, y, batch_size), verbose=0, return_dict=True)
+            for x, y in sets
+        ]
+
+    # model.evaluate와 동일하게 정규화 손실을 손실 값에 더한다.
+    reg_loss = float(tf.add_n(model.losses)) if model.losses else 0.0
+
+    xs = [np.asarray(x) for x, _ in sets]
+    y_pred = model.predict(
+        np.concatenate(xs), batch_size=max(batch_size, 1024), verbose=0
+    )
+
+    result = []
+    start = 0
+
+    for x, (_, y) in zip(xs, sets):
+        p = y_pred[start : start + len(x)]
+        start += len(x)
+
+        t = np.asarray(y, dtype=p.dtype)
+
+        if t.size == p.size:
+            t = t.reshape(p.shape)
+
+        row = {name: float(np.mean(fn(t, p))) for name, fn in fns.items()}
+
+        if "loss" in row:
+            row["loss"] += reg_loss
+
+        result.append(row)
+
+    return result
 
 
 # -------------------------------------------------------------
@@ -70,6 +500,10 @@ def tf_tune(
     seed: int = get_random_state(),
     directory: str = __HB_DIR__,
     project_name: str = None,
+    use_mixed_precision: bool = True,
+    xla: bool = True,
+    steps_per_execution: int = 32,
+    parallel_trials: int = 1,
 ) -> Sequential:
     """_summary_
 
@@ -87,80 +521,74 @@ def tf_tune(
         factor (int, optional): _description_. Defaults to 3.
         seed (_type_, optional): _description_. Defaults to get_random_state().
         directory (str, optional): _description_. Defaults to "./tensor_hyperband".
-        project_name (_type_, optional): _description_. Defaults to "tf_hyperband_%s"%dt.now().strftime("%Y%m%d%H%M%S").
+        project_name (_type_, optional): _description_. 지정하지 않으면 탐색 공간으로부터 생성된 이름을 사용하여 동일한 조건의 이전 탐색 결과를 재사용한다. Defaults to None.
+        use_mixed_precision (bool, optional): 혼합 정밀도(mixed_float16) 사용 여부. Compute Capability 7.0 이상의 GPU에서만 적용되며, 전역 정책은 모델 생성 중에만 변경되고 이후 원래대로 복원된다. 적용되지 않는 경우에는 현재 전역 정책을 그대로 사용한다. Defaults to True.
+        xla (bool, optional): 각 trial 모델에 XLA JIT 컴파일을 사용할지 여부. Defaults to True.
+        steps_per_execution (int, optional): 한 번의 tf.function 호출에서 처리할 배치 수. Defaults to 32.
+        parallel_trials (int, optional): 동시에 실행할 trial 수. 2 이상이면 KerasTuner 분산 탐색으로 여러 프로세스에서 trial을 병렬로 훈련한다. 스크립트에서는 `if __name__ == "__main__":` 블록 안에서 호출해야 한다. Defaults to 1.
 
     Returns:
         Sequential: _description_
     """
-
-    def __tf_build(hp) -> Sequential:
-        model = Sequential()
-
-        for d in dense_tune:
-            if "input_shape" in d:
-                model.add(
-                    Dense(
-                        units=(
-                            hp.Choice("units", values=d["units"])
-                            if type(d["units"]) == list
-                            else d["units"]
-                        ),
-                        input_shape=d["input_shape"],
-                        activation=d["activation"],
-                    )
-                )
-            else:
-                model.add(
-                    Dense(
-                        units=(
-                            hp.Choice("units", values=d["units"])
-                            if type(d["units"]) == list
-                            else d["units"]
-                        ),
-                        activation=d["activation"],
-                    )
-                )
-
-        opt = None
-
-        if optimizer == "adam":
-            opt = Adam(hp.Choice("learning_rate", values=learning_rate))
-        elif optimizer == "rmsprop":
-            opt = RMSprop(hp.Choice("learning_rate", values=learning_rate))
-
-        model.compile(
-            optimizer=opt,
-            loss=loss,
-            metrics=metrics,
+    # 지정된 project_name이 없을 때만 데이터 지문을 포함한 탐색 조건으로 이름을 생성한다.
+    if not project_name:
+        project_name = __get_project_name(
+            (
+                dense_tune,
+                optimizer,
+                learning_rate,
+                loss,
+                tuple(metrics or []),
+                epochs,
+                factor,
+                seed,
+                batch_size,
+                use_mixed_precision,
+                xla,
+                steps_per_execution,
+                # 다른 데이터(예: 교차검증의 다른 fold)로 이전 탐색 결과를 재사용하지 않도록 한다.
+                __get_fingerprint(x_train, y_train, x_test, y_test),
+            )
         )
 
-        return model
-
-    tuner = Hyperband(
-        hypermodel=__tf_build,
-        objective=f"val_{metrics[0]}",
-        max_epochs=epochs,
+    tuner_args = dict(
+        dense_tune=dense_tune,
+        optimizer=optimizer,
+        learning_rate=learning_rate,
+        loss=loss,
+        metrics=metrics,
+        epochs=epochs,
         factor=factor,
         seed=seed,
         directory=directory,
-        project_name=__get_project_name(project_name),
+        project_name=project_name,
+        use_mixed_precision=use_mixed_precision,
+        xla=xla,
+        steps_per_execution=steps_per_execution,
     )
 
-    tuner.search(
-        x_train,
-        y_train,
+    search_args = dict(
+        x=x_train,
+        y=y_train,
         epochs=epochs,
         batch_size=batch_size,
         validation_data=(x_test, y_test),
     )
 
+    if parallel_trials > 1:
+        __tf_search_parallel(parallel_trials, tuner_args, search_args)
+
+    # 병렬 탐색이 끝난 경우에는 완료된 oracle 상태를 다시 불러오므로 search가 곧바로 종료된다.
+    tuner = __tf_hyperband(**tuner_args)
+    tuner.search(**search_args)
+
     # Get the optimal hyperparameters
     best_hps = tuner.get_best_hyperparameters()
 
     if not best_hps:
         raise ValueError("No best hyperparameters found.")
 
-    model = tuner.hypermodel.build(best_hps[0])
+    model = tuner.get_best_models(num_models=1)[0]
     return model
 
 
@@ -172,16 +600,22 @@ def tf_create(
     loss: str = None,
     metrics: list = None,
     model_path: str = None,
+    xla: bool = True,
+    use_mixed_precision: bool = True,
+    steps_per_execution: int = 32,
 ) -> Sequential:
     """
     지정된 밀집 레이어, 최적화 프로그램, 손실 함수 및 측정항목을 사용하여 TensorFlow Sequential 모델을 생성하고 컴파일한다.
 
     Args:
-        dense (list, optional): 각 사전이 생성될 신경망 모델의 레이어를 나타내는 사전 목록. Defaults to [].
-        optimizer (any, optional): 훈련 중에 사용할 최적화 알고리즘. Defaults to "adam".
+        dense (list, optional): 생성될 신경망 모델의 각 레이어를 나타내는 LayerSpec 또는 사전 목록. 사전은 LayerSpec의 항목(units, activation, input_shape, dtype)만 사용하고 나머지 키는 무시한다. Defaults to [].
+        optimizer (any, optional): 훈련 중에 사용할 최적화 알고리즘. "adam", "rmsprop"은 legacy 구현(학습률 0.001)으로 생성된다. Defaults to "adam".
         loss (str, optional): 신경망 모델 학습 중에 최적화할 손실 함수를 지정. Defaults to None.
         metrics (list, optional): 모델 학습 중에 모니터링하려는 평가 측정항목. Defaults to None.
         model_path (str, optional): 로드하고 반환하려는 저장된 모델의 경로. Defaults to None.
+        xla (bool, optional): XLA JIT 컴파일 사용 여부. 입력 크기가 자주 바뀌는 경우 재컴파일이 발생하므로 False로 지정한다. Defaults to True.
+        use_mixed_precision (bool, optional): 혼합 정밀도(mixed_float16) 사용 여부. Compute Capability 7.0 이상의 GPU에서만 적용되며, 전역 정책은 모델 생성 중에만 변경되고 이후 원래대로 복원된다. 적용되지 않는 경우에는 현재 전역 정책을 그대로 사용한다. Defaults to True.
+        steps_per_execution (int, optional): 한 번의 tf.function 호출에서 처리할 배치 수. 작은 모델에서 배치마다 발생하는 호출 부담을 줄인다. Defaults to 32.
 
     Raises:
         ValueError: dense, loss 및 metrics는 필수 인수
@@ -190,34 +624,76 @@ def tf_create(
         Sequential: 컴파일 된 TensorFlow Sequential 모델
     """
 
+    import tensorflow as tf
+    from tensorflow.keras.models import Sequential, load_model
+    from tensorflow.keras.layers import Dense
+
     if model_path:
         return load_model(model_path)
 
     if not dense or not loss or not metrics:
         raise ValueError("dense, loss, and metrics are required arguments")
 
-    model = Sequential()
+    # 문자열로 지정된 최적화 알고리즘은 호출 부담이 적은 legacy 구현으로 대체한다.
+    if isinstance(optimizer, str):
+        optimizer = __get_optimizer(optimizer.lower(), 1e-3) or optimizer
 
-    for i, v in enumerate(dense):
-        if "input_shape" in v:
-            model.add(
-                Dense(
-                    units=v["units"],
-                    input_shape=v["input_shape"],
-                    activation=v["activation"],
-                    kernel_initializer=__initializer__,
-                )
+    policy = __get_precision_policy(use_mixed_precision)
+
+    with __precision_scope(policy):
+        initializer = __get_initializer()
+        input_shape = None
+        model = Sequential()
+
+        for i, v in enumerate(dense):
+            spec = (
+                v
+                if isinstance(v, LayerSpec)
+                else LayerSpec(**{k: v[k] for k in LayerSpec._fields if k in v})
             )
-        else:
-            model.add(
-                Dense(
-                    units=v["units"],
-                    activation=v["activation"],
-                    kernel_initializer=__initializer__,
+
+            # 혼합 정밀도에서도 출력과 손실은 float32로 계산한다.
+            is_last = i == len(dense) - 1
+
+            if is_last and policy == "mixed_float16" and spec.dtype is None:
+                spec = spec._replace(dtype="float32")
+
+            if spec.input_shape is not None:
+                input_shape = tuple(spec.input_shape)
+                model.add(
+                    Dense(
+                        units=spec.units,
+                        input_shape=spec.input_shape,
+                        activation=spec.activation,
+                        kernel_initializer=initializer,
+                        dtype=spec.dtype,
+                    )
+                )
+            else:
+                model.add(
+                    Dense(
+                        units=spec.units,
+                        activation=spec.activation,
+                        kernel_initializer=initializer,
+                        dtype=spec.dtype,
+                    )
                 )
-            )
 
-    model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+        model.compile(
+            optimizer=optimizer,
+            loss=loss,
+            metrics=metrics,
+            jit_compile=xla,
+            steps_per_execution=steps_per_execution,
+        )
+
+        # 가중치를 미리 할당하고 한 번 실행해 두어 첫 배치에서 발생하는 초기화 지연을 줄인다.
+        if input_shape is not None:
+            if not model.built:
+                model.build(input_shape=(None,) + input_shape)
+
+            model(tf.zeros((1,) + input_shape), training=False)
+
     return model
 
 
@@ -249,7 +725,7 @@ def tf_train(
         batch_size (int, optional): 배치 크기. Defaults to 32.
         early_stopping (bool, optional): 학습 조기 종료 기능 활성화 여부. Defaults to True.
         reduce_lr (bool, optional): 학습률 감소 기능 활성화 여부. Defaults to True.
-        checkpoint_path (str, optional): 체크포인트가 저장될 파일 경로. Defaults to None.
+        checkpoint_path (str, optional): 체크포인트가 저장될 파일 경로. Keras 3에서는 확장자가 .weights.h5로 변경된다. Defaults to None.
         tensorboard_path (str, optional): 텐서보드 로그가 저장될 디렉토리 경로. Defaults to None.
         verbose (int, optional): 학습 과정 출력 레벨. Defaults to 0.
 
@@ -257,17 +733,34 @@ def tf_train(
         History: 훈련 결과
     """
 
+    from tensorflow import keras
+    from tensorflow.keras.callbacks import (
+        EarlyStopping,
+        ReduceLROnPlateau,
+        TensorBoard,
+        ModelCheckpoint,
+    )
+
     callbacks = []
+    es = None
 
     if early_stopping:
-        callbacks.append(
-            EarlyStopping(patience=10, restore_best_weights=True, verbose=verbose)
-        )
+        es = EarlyStopping(patience=10, restore_best_weights=True, verbose=verbose)
+        callbacks.append(es)
 
     if reduce_lr:
         callbacks.append(ReduceLROnPlateau(factor=0.1, patience=5, verbose=verbose))
 
     if checkpoint_path:
+        # Keras 3은 가중치 파일에 .weights.h5 확장자만 허용하므로 확장자를 맞춘다.
+        keras3 = int(keras.__version__.split(".")[0]) >= 3
+
+        if keras3 and not checkpoint_path.endswith(".weights.h5"):
+            if checkpoint_path.endswith(".h5"):
+                checkpoint_path = checkpoint_path[:-3]
+
+            checkpoint_path += ".weights.h5"
+
         callbacks.append(
             ModelCheckpoint(
                 filepath=checkpoint_path,
@@ -282,26 +775,63 @@ def tf_train(
             TensorBoard(log_dir=tensorboard_path, histogram_freq=1, write_graph=True)
         )
 
-    history = model.fit(
+    # steps_per_execution과 XLA가 고정된 배치 크기로 동작하도록 훈련 데이터의 남는 배치는 버린다.
+    train_ds = __tf_dataset(
         x_train,
         y_train,
+        batch_size,
+        shuffle=True,
+        drop_remainder=len(x_train) >= batch_size,
+    )
+    test_ds = (
+        __tf_dataset(x_test, y_test, batch_size)
+        if x_test is not None and y_test is not None
+        else None
+    )
+
+    history = model.fit(
+        train_ds,
         epochs=epochs,
-        batch_size=batch_size,
-        validation_data=(x_test, y_test) if x_test is not None else None,
+        validation_data=test_ds,
         verbose=verbose,
         callbacks=callbacks,
     )
 
-    dataset = []
+    dataset = ["train"] if test_ds is None else ["train", "test"]
     result_set = []
 
-    if x_train is not None and y_train is not None:
-        dataset.append("train")
-        result_set.append(model.evaluate(x_train, y_train, verbose=0, return_dict=True))
+    # 마지막 epoch의 가중치가 유지된 경우에는 추가 평가 없이 훈련 기록의 마지막 값을 사용한다.
+    # 조기 종료로 이전 epoch의 가중치가 복원된 경우에만 다시 평가한다.
+    h = {k: v for k, v in history.history.items() if k not in ("lr", "learning_rate")}
+    last_epoch = len(history.epoch) - 1
+    # 검증 데이터가 없으면 val_loss를 감시하는 조기 종료가 동작하지 않으므로 복원될 가중치도 없다.
+    # best_epoch를 제공하지 않는 버전에서는 가중치가 복원되었다고 가정하고 다시 평가한다.
+    restored = False
+
+    if es is not None and test_ds is not None:
+        best_epoch = getattr(es, "best_epoch", None)
+        has_best = (
+            es.best_weights is not None
+            if hasattr(es, "best_weights")
+            else es.stopped_epoch > 0
+        )
+        restored = has_best and best_epoch != last_epoch
+
+    if restored:
+        sets = [(x_train, y_train)]
 
-    if x_test is not None and y_test is not None:
-        dataset.append("test")
-        result_set.append(model.evaluate(x_test, y_test, verbose=0, return_dict=True))
+        if test_ds is not None:
+            sets.append((x_test, y_test))
+
+        names = [k for k in h if not k.startswith("val_")]
+        result_set = __tf_evaluate(model, sets, names, batch_size)
+    else:
+        result_set.append({k: v[-1] for k, v in h.items() if not k.startswith("val_")})
+
+        if test_ds is not None:
+            result_set.append(
+                {k[4:]: v[-1] for k, v in h.items() if k.startswith("val_")}
+            )
 
     result_df = DataFrame(result_set, index=dataset)
     my_pretty_table(result_df)
@@ -327,31 +857,18 @@ def tf_result(
     Returns:
         Sequential: 훈련된 TensorFlow Sequential 모델
     """
-    result_df = DataFrame(result.history)
-    result_df["epochs"] = result_df.index + 1
-    result_df.set_index("epochs", inplace=True)
-
-    columns = result_df.columns[:-1]
-    s = len(columns)
+    history = result.history
+    epochs = np.arange(1, len(next(iter(history.values()))) + 1)
 
-    group_names = []
+    # 학습률 변화(ReduceLROnPlateau)는 그래프에서 제외한다.
+    columns = [c for c in history if c not in ("lr", "learning_rate")]
+    val_set = {c[4:] for c in columns if c.startswith("val_")}
 
-    for i in range(0, s - 1):
-        if columns[i][:3] == "val":
-            break
-
-        t = f"val_{columns[i]}"
-        c2 = list(columns[i + 1 :])
-
-        try:
-            var_index = c2.index(t)
-        except:
-            var_index = -1
-
-        if var_index > -1:
-            group_names.append([columns[i], t])
-        else:
-            group_names.append([columns[i]])
+    group_names = [
+        [c, f"val_{c}"] if c in val_set else [c]
+        for c in columns
+        if not c.startswith("val_")
+    ]
 
     cols = len(group_names)
 
@@ -361,13 +878,19 @@ def tf_result(
         ax = [ax]
 
     for i in range(0, cols):
-        result_df.plot(y=group_names[i], ax=ax[i])
+        for name in group_names[i]:
+            ax[i].plot(epochs, history[name], label=name)
+
+        ax[i].set_xlabel("epochs")
+        ax[i].legend()
         ax[i].grid()
 
     plt.show()
     plt.close()
 
     if history_table:
+        result_df = DataFrame(history, index=epochs)
+        result_df.index.name = "epochs"
         my_pretty_table(result_df)
 
 
@@ -393,6 +916,9 @@ def my_tf(
     history_table: bool = False,
     figsize: tuple = (7, 5),
     dpi: int = 100,
+    xla: bool = True,
+    use_mixed_precision: bool = True,
+    steps_per_execution: int = 32,
     # hyperband parameters
     dense_tune: list = [],
     learning_rate: list = [1e-2, 1e-3, 1e-4],
@@ -409,7 +935,7 @@ def my_tf(
         y_train (np.ndarray): 훈련 데이터에 대한 종속변수
         x_test (np.ndarray, optional): 테스트 데이터에 대한 독립변수. Defaults to None.
         y_test (np.ndarray, optional): 테스트 데이터에 대한 종속변수. Defaults to None.
-        dense (list, optional): 각 사전이 생성될 신경망 모델의 레이어를 나타내는 사전 목록. Defaults to [].
+        dense (list, optional): 생성될 신경망 모델의 각 레이어를 나타내는 LayerSpec 또는 사전 목록. Defaults to [].
         optimizer (any, optional): 훈련 중에 사용할 최적화 알고리즘. Defaults to "adam".
         loss (str, optional): 신경망 모델 학습 중에 최적화할 손실 함수를 지정. Defaults to None.
         metrics (list, optional): 모델 학습 중에 모니터링하려는 평가 측정항목. Defaults to None.
@@ -424,6 +950,9 @@ def my_tf(
         history_table (bool, optional): 훈련 결과를 표로 출력할지 여부. Defaults to False.
         figsize (tuple, optional): 그래프 크기. Defaults to (7, 5).
         dpi (int, optional): 그래프 해상도. Defaults to 100.
+        xla (bool, optional): XLA JIT 컴파일 사용 여부. Defaults to True.
+        use_mixed_precision (bool, optional): 혼합 정밀도(mixed_float16) 사용 여부. Compute Capability 7.0 이상의 GPU에서만 적용되며, 전역 정책은 모델 생성 중에만 변경되고 이후 원래대로 복원된다. 적용되지 않는 경우에는 현재 전역 정책을 그대로 사용한다. Defaults to True.
+        steps_per_execution (int, optional): 한 번의 tf.function 호출에서 처리할 배치 수. Defaults to 32.
 
     Returns:
         Sequential: 훈련된 TensorFlow Sequential 모델
@@ -444,7 +973,10 @@ def my_tf(
             factor=factor,
             seed=seed,
             directory=directory,
-            project_name=__get_project_name(project_name),
+            project_name=project_name,
+            use_mixed_precision=use_mixed_precision,
+            xla=xla,
+            steps_per_execution=steps_per_execution,
         )
     else:
         model = tf_create(
@@ -453,6 +985,9 @@ def my_tf(
             loss=loss,
             metrics=metrics,
             model_path=model_path,
+            xla=xla,
+            use_mixed_precision=use_mixed_precision,
+            steps_per_execution=steps_per_execution,
         )
 
     result = tf_train(
@@ -497,11 +1032,12 @@ def my_tf_linear(
     history_table: bool = False,
     figsize: tuple = (7, 5),
     dpi: int = 100,
+    use_mixed_precision: bool = True,
     # hyperband parameters
     dense_tune: list = [
         {"units": [128, 64, 32, 16, 8], "activation": "relu", "input_shape": (0,)},
         {"units": [64, 32, 16, 8, 4], "activation": "relu"},
-        {"units": 1, "activation": "linear"},
+        {"units": 1, "activation": "linear", "dtype": "float32"},
     ],
     learning_rate: list = [1e-2, 1e-3, 1e-4],
     factor=3,
@@ -533,6 +1069,7 @@ def my_tf_linear(
         history_table (bool, optional): 훈련 결과를 표로 출력할지 여부. Defaults to False.
         figsize (tuple, optional): 그래프 크기. Defaults to (7, 5).
         dpi (int, optional): 그래프 해상도. Defaults to 100.
+        use_mixed_precision (bool, optional): 혼합 정밀도(mixed_float16) 사용 여부. Compute Capability 7.0 이상의 GPU에서만 적용되며, 출력층은 항상 float32로 계산된다. Defaults to True.
 
     Returns:
         Sequential: 훈련된 TensorFlow Sequential 모델
@@ -555,31 +1092,20 @@ def my_tf_linear(
             history_table=history_table,
             figsize=figsize,
             dpi=dpi,
+            use_mixed_precision=use_mixed_precision,
             # hyperband parameters
             dense_tune=dense_tune,
             learning_rate=learning_rate,
             factor=factor,
             seed=seed,
             directory=directory,
-            project_name=__get_project_name(project_name),
+            project_name=project_name,
         )
     else:
-        dense = []
-
-        s = len(dense_units)
-        for i, v in enumerate(iterable=dense_units):
-            if i == 0:
-                dense.append(
-                    {
-                        "units": v,
-                        "input_shape": (x_train.shape[1],),
-                        "activation": "relu",
-                    }
-                )
-            else:
-                dense.append({"units": v, "activation": "relu"})
-
-        dense.append({"units": 1, "activation": "linear"})
+        dense = [
+            LayerSpec(v, "relu", (x_train.shape[1],) if i == 0 else None)
+            for i, v in enumerate(dense_units)
+        ] + [LayerSpec(1, "linear", dtype="float32")]
 
         model = my_tf(
             x_train=x_train,
@@ -601,6 +1127,7 @@ def my_tf_linear(
             history_table=history_table,
             figsize=figsize,
             dpi=dpi,
+            use_mixed_precision=use_mixed_precision,
         )
 
     my_regression_result(
@@ -649,10 +1176,11 @@ def my_tf_sigmoid(
     history_table: bool = False,
     figsize: tuple = (7, 5),
     dpi: int = 100,
+    use_mixed_precision: bool = True,
     # hyperband parameters
     dense_tune: list = [
         {"units": [256, 128, 64, 32], "activation": "relu", "input_shape": (0,)},
-        {"units": 1, "activation": "sigmoid"},
+        {"units": 1, "activation": "sigmoid", "dtype": "float32"},
     ],
     learning_rate: list = [1e-2, 1e-3, 1e-4],
     factor=3,
@@ -683,6 +1211,7 @@ def my_tf_sigmoid(
         history_table (bool, optional): 훈련 결과를 표로 출력할지 여부. Defaults to False.
         figsize (tuple, optional): 그래프 크기. Defaults to (7, 5).
         dpi (int, optional): 그래프 해상도. Defaults to 100.
+        use_mixed_precision (bool, optional): 혼합 정밀도(mixed_float16) 사용 여부. Compute Capability 7.0 이상의 GPU에서만 적용되며, 출력층은 항상 float32로 계산된다. Defaults to True.
 
     Returns:
         Sequential: 훈련된 TensorFlow Sequential 모델
@@ -705,31 +1234,20 @@ def my_tf_sigmoid(
             history_table=history_table,
             figsize=figsize,
             dpi=dpi,
+            use_mixed_precision=use_mixed_precision,
             # hyperband parameters
             dense_tune=dense_tune,
             learning_rate=learning_rate,
             factor=factor,
             seed=seed,
             directory=directory,
-            project_name=__get_project_name(project_name),
+            project_name=project_name,
         )
     else:
-        dense = []
-
-        s = len(dense_units)
-        for i, v in enumerate(iterable=dense_units):
-            if i == 0:
-                dense.append(
-                    {
-                        "units": v,
-                        "input_shape": (x_train.shape[1],),
-                        "activation": "relu",
-                    }
-                )
-            else:
-                dense.append({"units": v, "activation": "relu"})
-
-        dense.append({"units": 1, "activation": "sigmoid"})
+        dense = [
+            LayerSpec(v, "relu", (x_train.shape[1],) if i == 0 else None)
+            for i, v in enumerate(dense_units)
+        ] + [LayerSpec(1, "sigmoid", dtype="float32")]
 
         model = my_tf(
             x_train=x_train,
@@ -751,6 +1269,7 @@ def my_tf_sigmoid(
             history_table=history_table,
             figsize=figsize,
             dpi=dpi,
+            use_mixed_precision=use_mixed_precision,
         )
 
     my_classification_result(